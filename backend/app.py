@@ -3,32 +3,159 @@ Diabetes Prediction System - Flask Backend API
 Complete with Analytics Dashboard API
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
+from whitenoise import WhiteNoise
+from flask_orjson import OrjsonProvider
+import orjson
 import joblib
+from sklearn.pipeline import Pipeline
 import numpy as np
 import pandas as pd
 import os
 import json
-from datetime import datetime, timedelta
+import functools
+import math
+import itertools
+from collections import deque
+from datetime import datetime
 import traceback
+import queue
+import threading
+import uuid
+
+try:
+    from numba import njit
+except ImportError:  # Fall back to sklearn's predict_proba
+    njit = None
+
+try:
+    import onnxruntime as ort
+except ImportError:  # Fall back to the joblib model
+    ort = None
 
 # Initialize Flask app
 app = Flask(__name__, static_folder='../frontend', static_url_path='')
 CORS(app)  # Enable CORS for all routes
 
+def wrap_static(wsgi_app, autorefresh=False):
+    """Serve the frontend (index.html + assets) through WhiteNoise"""
+    return WhiteNoise(wsgi_app, root=app.static_folder, max_age=3600, index_file=True, autorefresh=autorefresh)
+
+# Files are indexed once at startup and served from WhiteNoise's in-process cache
+app.wsgi_app = wrap_static(app.wsgi_app)
+
+# Use orjson for all jsonify() responses (compact, unsorted)
+app.json = OrjsonProvider(app)
+
 # Load trained model and scaler
 MODEL_PATH = 'model/model.pkl'
 SCALER_PATH = 'model/scaler.pkl'
+PIPELINE_PATH = 'model/pipeline.pkl'
+ONNX_PATH = 'model/model.onnx'
 
 try:
-    model = joblib.load(MODEL_PATH)
-    scaler = joblib.load(SCALER_PATH)
+    if os.path.exists(PIPELINE_PATH):
+        # Single fused artifact; scaler/model are still exposed for the fast single-row path
+        pipeline = joblib.load(PIPELINE_PATH)
+        scaler = pipeline.named_steps['scaler']
+        model = pipeline.named_steps['model']
+    else:
+        model = joblib.load(MODEL_PATH)
+        scaler = joblib.load(SCALER_PATH)
+        pipeline = Pipeline([('scaler', scaler), ('model', model)])
     print("✅ Model and scaler loaded successfully")
 except Exception as e:
     print(f"❌ Error loading model/scaler: {e}")
     model = None
     scaler = None
+    pipeline = None
+
+# Scaler + model exported as one ONNX graph (raw float32 features in, probabilities out)
+onnx_session = None
+if ort is not None and os.path.exists(ONNX_PATH):
+    try:
+        onnx_session = ort.InferenceSession(ONNX_PATH, providers=['CPUExecutionProvider'])
+        print("✅ ONNX model loaded successfully")
+    except Exception as e:
+        print(f"⚠️  Could not load ONNX model, using joblib model: {e}")
+
+# Fold StandardScaler into a single subtract-multiply (skips sklearn validation overhead)
+if scaler is not None:
+    MEAN = scaler.mean_.astype(np.float64)
+    INV_SCALE = (1.0 / scaler.scale_).astype(np.float64)
+else:
+    MEAN = None
+    INV_SCALE = None
+
+def compile_forest(forest):
+    """
+    Flatten a fitted RandomForest into padded (n_trees, n_nodes) node arrays
+    """
+    trees = [estimator.tree_ for estimator in forest.estimators_]
+    n_trees = len(trees)
+    n_nodes = max(tree.node_count for tree in trees)
+    n_classes = forest.n_classes_
+    
+    feat = np.zeros((n_trees, n_nodes), dtype=np.int64)
+    thr = np.zeros((n_trees, n_nodes), dtype=np.float64)
+    left = np.full((n_trees, n_nodes), -1, dtype=np.int64)
+    right = np.full((n_trees, n_nodes), -1, dtype=np.int64)
+    leaf_p = np.zeros((n_trees, n_nodes, n_classes), dtype=np.float64)
+    
+    for t, tree in enumerate(trees):
+        n = tree.node_count
+        feat[t, :n] = np.maximum(tree.feature, 0)  # Leaves store -2; never read
+        thr[t, :n] = tree.threshold
+        left[t, :n] = tree.children_left
+        right[t, :n] = tree.children_right
+        value = tree.value[:, 0, :]
+        leaf_p[t, :n] = value / value.sum(axis=1, keepdims=True)
+    
+    return feat, thr, left, right, leaf_p
+
+def _rf_predict_proba(x, feat, thr, left, right, leaf_p):
+    """
+    Walk every tree for a single row and average the leaf class probabilities
+    """
+    n_trees = feat.shape[0]
+    proba = np.zeros(leaf_p.shape[2])
+    for t in range(n_trees):
+        node = 0
+        while left[t, node] != -1:
+            if x[feat[t, node]] <= thr[t, node]:
+                node = left[t, node]
+            else:
+                node = right[t, node]
+        proba += leaf_p[t, node]
+    return proba / n_trees
+
+rf_predict_proba = njit(cache=True)(_rf_predict_proba) if njit is not None else None
+
+def verify_forest(forest, arrays, n_rows=32):
+    """
+    Score random rows with both the kernel and sklearn; True if they agree.
+    Also triggers the JIT compile so the first request doesn't pay for it.
+    """
+    rng = np.random.default_rng(42)
+    rows = rng.normal(size=(n_rows, forest.n_features_in_)).astype(np.float32)
+    expected = forest.predict_proba(rows)
+    actual = np.array([rf_predict_proba(row, *arrays) for row in rows])
+    return np.allclose(actual, expected)
+
+# Compile the forest once at load time when Numba is available
+FOREST = None
+if rf_predict_proba is not None and hasattr(model, 'estimators_'):
+    try:
+        FOREST = compile_forest(model)
+        if verify_forest(model, FOREST):
+            print("✅ RandomForest compiled to Numba kernel")
+        else:
+            FOREST = None
+            print("⚠️  Numba kernel disagrees with sklearn, using sklearn")
+    except Exception as e:
+        FOREST = None
+        print(f"⚠️  Could not compile RandomForest, using sklearn: {e}")
 
 # Feature names in correct order
 FEATURES = [
@@ -36,66 +163,245 @@ FEATURES = [
     'Insulin', 'BMI', 'DiabetesPedigreeFunction', 'Age'
 ]
 
+HISTORY_SIZE = 1000
+
 # In-memory storage for analytics (in production, use database)
 analytics_data = {
-    'predictions_history': [],
+    'predictions_history': deque(maxlen=HISTORY_SIZE),  # Keep only last 1000 predictions
+    'ts_array': np.empty(HISTORY_SIZE, dtype=np.float64),  # Circular buffer of epoch timestamps
+    'ts_index': 0,
     'user_sessions': [],
     'risk_distribution': {'low': 0, 'medium': 0, 'high': 0},
     'total_predictions': 0,
     'model_accuracy': 94.2
 }
 
-def preprocess_input(data):
+# Canonical feature name -> accepted input keys, in priority order
+_ALIASES = {
+    'Pregnancies': ('Pregnancies', 'pregnancies'),
+    'Glucose': ('Glucose', 'glucose'),
+    'BloodPressure': ('BloodPressure', 'blood_pressure'),
+    'SkinThickness': ('SkinThickness', 'skin_thickness'),
+    'Insulin': ('Insulin', 'insulin'),
+    'BMI': ('BMI', 'bmi'),
+    'DiabetesPedigreeFunction': ('DiabetesPedigreeFunction', 'diabetes_pedigree', 'diabetesPedigreeFunction'),
+    'Age': ('Age', 'age')
+}
+
+# Fields that must be present (under any alias / casing) for a prediction
+REQUIRED_FIELDS = ['Glucose', 'BMI', 'Age']
+_REQUIRED_KEYS = frozenset(REQUIRED_FIELDS)
+
+# Default values for features missing from user input
+_DEFAULTS = {
+    'Pregnancies': 0.0,
+    'Glucose': 0.0,
+    'BloodPressure': 0.0,
+    'SkinThickness': 0.0,
+    'Insulin': 0.0,
+    'BMI': 0.0,
+    'DiabetesPedigreeFunction': 0.5,
+    'Age': 30.0
+}
+
+# Input key -> (canonical feature name, priority; lower wins), built once.
+# Exact aliases carry their position in _ALIASES; any other casing is looked
+# up by its lower-cased form, which ranks below every listed alias.
+_FALLBACK_PRIORITY = max(len(aliases) for aliases in _ALIASES.values())
+_KEY_TABLE = {}
+for _canonical, _aliases in _ALIASES.items():
+    for _priority, _alias in enumerate(_aliases):
+        _KEY_TABLE[_alias] = (_canonical, _priority)
+_EXACT_KEYS = frozenset(_KEY_TABLE)
+_CANONICAL_KEYS = frozenset(_ALIASES)
+_EXACT_CANONICAL = {alias: canonical for alias, (canonical, _) in _KEY_TABLE.items()}
+for _canonical, _aliases in _ALIASES.items():
+    for _alias in _aliases:
+        _KEY_TABLE.setdefault(_alias.lower(), (_canonical, _FALLBACK_PRIORITY))
+
+def resolve_input(data):
     """
-    Preprocess user input similar to training pipeline
+    Map user input onto canonical feature names in a single pass over the keys
     """
-    # Convert to numpy array in correct feature order
-    input_data = np.array([
-        float(data.get('Pregnancies', data.get('pregnancies', 0))),
-        float(data.get('Glucose', data.get('glucose', 0))),
-        float(data.get('BloodPressure', data.get('blood_pressure', 0))),
-        float(data.get('SkinThickness', data.get('skin_thickness', 0))),
-        float(data.get('Insulin', data.get('insulin', 0))),
-        float(data.get('BMI', data.get('bmi', 0))),
-        float(data.get('DiabetesPedigreeFunction', data.get('diabetes_pedigree', data.get('diabetesPedigreeFunction', 0.5)))),
-        float(data.get('Age', data.get('age', 30)))
-    ]).reshape(1, -1)
+    # Fast paths: only canonical names, or only known aliases with no duplicates
+    if _CANONICAL_KEYS.issuperset(data):
+        return data
+    if _EXACT_KEYS.issuperset(data):
+        resolved = {_EXACT_CANONICAL[key]: value for key, value in data.items()}
+        if len(resolved) == len(data):
+            return resolved
     
-    # Apply same scaling as during training
-    scaled_data = scaler.transform(input_data)
-    return scaled_data
+    # Slow path: unknown keys, other casings or several aliases for one feature
+    resolved = {}
+    priorities = {}
+    for key, value in data.items():
+        entry = _KEY_TABLE.get(key)
+        if entry is None:
+            entry = _KEY_TABLE.get(key.lower())
+            if entry is None:
+                continue
+        canonical, priority = entry
+        if priority < priorities.get(canonical, _FALLBACK_PRIORITY + 1):
+            resolved[canonical] = value
+            priorities[canonical] = priority
+    return resolved
+
+def missing_required_fields(resolved):
+    """
+    List required fields absent from resolved user input
+    """
+    if _REQUIRED_KEYS <= resolved.keys():
+        return []
+    return [field for field in REQUIRED_FIELDS if field not in resolved]
 
-def update_analytics(prediction_data, risk_level, confidence):
+def normalize_input(resolved):
+    """
+    Fill defaults and convert resolved user input to floats.
+    Raises ValueError/TypeError for non-numeric or non-finite (NaN / inf) values.
+    """
+    features = _DEFAULTS.copy()
+    for canonical, value in resolved.items():
+        value = float(value)
+        if not math.isfinite(value):
+            raise ValueError(f'{canonical} must be a finite number')
+        features[canonical] = value
+    return features
+
+def preprocess_raw(features):
+    """
+    Extract raw feature values from normalized input in correct feature order
+    """
+    return [features[name] for name in FEATURES]
+
+def scale_features_inplace(input_data):
+    """
+    Standardize a (1, 8) buffer in place (no temporaries allocated)
+    """
+    np.subtract(input_data, MEAN, out=input_data)
+    np.multiply(input_data, INV_SCALE, out=input_data)
+    return input_data
+
+# Per-thread single-row input buffers, reused across requests
+_buffers = threading.local()
+
+def _input_buffer(dtype=np.float64):
+    """
+    Return this thread's preallocated (1, 8) input buffer of the given dtype.
+    Contents are overwritten by the next call on the same thread.
+    """
+    name = np.dtype(dtype).name
+    buf = getattr(_buffers, name, None)
+    if buf is None:
+        buf = np.empty((1, len(FEATURES)), dtype=dtype)
+        setattr(_buffers, name, buf)
+    return buf
+
+def quantize_features(features):
+    """
+    Build a hashable, rounded feature tuple used as the prediction cache key
+    """
+    raw = preprocess_raw(features)
+    return (
+        int(raw[0]),            # Pregnancies
+        round(raw[1], 0),       # Glucose (1 mg/dL)
+        round(raw[2], 0),       # BloodPressure
+        round(raw[3], 0),       # SkinThickness
+        round(raw[4], 0),       # Insulin
+        round(raw[5], 1),       # BMI (0.1)
+        round(raw[6], 3),       # DiabetesPedigreeFunction
+        int(raw[7])             # Age
+    )
+
+@functools.lru_cache(maxsize=4096)
+def _cached_predict(feat_tuple):
+    """
+    Run scaler + model on a quantized feature tuple (memoized)
+    """
+    if onnx_session is not None:
+        # Scaling happens inside the ONNX graph; feed raw features
+        input_data = _input_buffer(np.float32)
+        input_data[0] = feat_tuple
+        prediction_proba = onnx_session.run(None, {'input': input_data})[1][0]
+        prediction = int(prediction_proba[1] > 0.5)
+        return prediction, tuple(float(p) for p in prediction_proba)
+    
+    scaled_data = _input_buffer()
+    scaled_data[0] = feat_tuple
+    scale_features_inplace(scaled_data)
+    
+    if FOREST is not None:
+        # sklearn evaluates splits on float32 inputs; mirror that for identical results
+        kernel_input = _input_buffer(np.float32)
+        kernel_input[0] = scaled_data[0]
+        prediction_proba = rf_predict_proba(kernel_input[0], *FOREST)
+    else:
+        prediction_proba = model.predict_proba(scaled_data)[0]
+    
+    # predict() is argmax(predict_proba), which picks class 0 on a 0.5 tie;
+    # threshold locally instead of a second pass
+    prediction = int(prediction_proba[1] > 0.5)
+    return prediction, tuple(float(p) for p in prediction_proba)
+
+def update_analytics(prediction_data, risk_level, confidence, user_agent, ts_epoch):
     """
     Update analytics data with new prediction
     """
     prediction_record = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': datetime.fromtimestamp(ts_epoch).isoformat(),
+        'ts_epoch': ts_epoch,
         'prediction': prediction_data,
         'risk_level': risk_level,
         'confidence': confidence,
-        'user_agent': request.headers.get('User-Agent', 'Unknown')
+        'user_agent': user_agent
     }
     
-    analytics_data['predictions_history'].append(prediction_record)
-    analytics_data['risk_distribution'][risk_level] += 1
-    analytics_data['total_predictions'] += 1
-    
-    # Keep only last 1000 predictions
-    if len(analytics_data['predictions_history']) > 1000:
-        analytics_data['predictions_history'] = analytics_data['predictions_history'][-1000:]
+    with _analytics_lock:
+        analytics_data['predictions_history'].append(prediction_record)
+        analytics_data['ts_array'][analytics_data['ts_index'] % HISTORY_SIZE] = prediction_record['ts_epoch']
+        analytics_data['ts_index'] += 1
+        analytics_data['risk_distribution'][risk_level] += 1
+        analytics_data['total_predictions'] += 1
 
-# ====================== API ROUTES ======================
+# Analytics updates are applied off the request path by a single drainer thread.
+# Counters are per-process when running under multiple gunicorn workers.
+def _init_analytics_worker():
+    """(Re)create the analytics queue, locks and process token for the current process"""
+    global _analytics_q, _analytics_lock, _drainer_lock, _drainer_started, _process_token
+    _process_token = uuid.uuid4().hex  # Distinguishes this process's analytics in ETags
+    _analytics_q = queue.Queue()
+    _analytics_lock = threading.Lock()
+    _drainer_lock = threading.Lock()
+    _drainer_started = False
+
+_init_analytics_worker()
 
-@app.route('/')
-def serve_frontend():
-    """Serve the frontend index.html"""
-    return send_from_directory(app.static_folder, 'index.html')
+# A forked worker inherits the parent's queue/locks (including waiters of a
+# drainer thread that doesn't exist in the child); give it fresh ones
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_init_analytics_worker)
 
-@app.route('/<path:path>')
-def serve_static(path):
-    """Serve static files"""
-    return send_from_directory(app.static_folder, path)
+def _drain():
+    """Apply queued prediction records to analytics_data"""
+    while True:
+        record = _analytics_q.get()
+        try:
+            update_analytics(*record)
+        except Exception as e:
+            print(f"Analytics update error: {str(e)}")
+        finally:
+            _analytics_q.task_done()
+
+def enqueue_analytics(record):
+    """Queue a prediction record, starting this process's drainer on first use"""
+    global _drainer_started
+    if not _drainer_started:
+        with _drainer_lock:
+            if not _drainer_started:
+                threading.Thread(target=_drain, daemon=True).start()
+                _drainer_started = True
+    _analytics_q.put(record)
+
+# ====================== API ROUTES ======================
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -104,6 +410,7 @@ def health_check():
         'status': 'healthy',
         'model_loaded': model is not None,
         'scaler_loaded': scaler is not None,
+        'onnx_loaded': onnx_session is not None,
         'timestamp': datetime.now().isoformat()
     })
 
@@ -128,9 +435,15 @@ def predict():
                 'status': 'error'
             }), 400
         
+        if not isinstance(data, dict):
+            return jsonify({
+                'error': 'Expected a JSON object',
+                'status': 'error'
+            }), 400
+        
         # Validate required fields
-        required_fields = ['Glucose', 'BMI', 'Age']
-        missing_fields = [field for field in required_fields if field.lower() not in data and field not in data]
+        resolved = resolve_input(data)
+        missing_fields = missing_required_fields(resolved)
         
         if missing_fields:
             return jsonify({
@@ -138,12 +451,18 @@ def predict():
                 'status': 'error'
             }), 400
         
-        # Preprocess input
-        processed_data = preprocess_input(data)
+        # Preprocess input into a quantized cache key
+        try:
+            features = normalize_input(resolved)
+        except (TypeError, ValueError) as e:
+            return jsonify({
+                'error': f'Invalid input: {e}',
+                'status': 'error'
+            }), 400
+        feat_tuple = quantize_features(features)
         
-        # Make prediction
-        prediction = model.predict(processed_data)[0]
-        prediction_proba = model.predict_proba(processed_data)[0]
+        # Make prediction (served from LRU cache on repeat inputs)
+        prediction, prediction_proba = _cached_predict(feat_tuple)
         
         # Get confidence scores
         non_diabetic_prob = prediction_proba[0] * 100
@@ -158,10 +477,11 @@ def predict():
             risk_level = 'high'
         
         # Update analytics
-        update_analytics(data, risk_level, diabetic_prob)
+        user_agent = request.headers.get('User-Agent', 'Unknown')
+        enqueue_analytics((data, risk_level, diabetic_prob, user_agent, datetime.now().timestamp()))
         
         # Generate health advice
-        health_advice = generate_health_advice(prediction, diabetic_prob, data)
+        health_advice = generate_health_advice(prediction, diabetic_prob, features)
         
         # Prepare response
         result = {
@@ -187,66 +507,189 @@ def predict():
             'status': 'error'
         }), 500
 
+# Upper bound on records accepted by /api/predict/batch
+MAX_BATCH_SIZE = 1000
+
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    """
+    Predict diabetes status for a list of records in a single vectorized call
+    """
+    if model is None or scaler is None:
+        return jsonify({
+            'error': 'Model not loaded',
+            'status': 'error'
+        }), 500
+    
+    try:
+        payload = request.get_json()
+        
+        if not payload or not isinstance(payload, list):
+            return jsonify({
+                'error': 'Expected a non-empty list of records',
+                'status': 'error'
+            }), 400
+        
+        if len(payload) > MAX_BATCH_SIZE:
+            return jsonify({
+                'error': f'Batch too large: at most {MAX_BATCH_SIZE} records per request',
+                'status': 'error'
+            }), 413
+        
+        # Validate and featurize every record
+        feat_tuples = []
+        for i, record in enumerate(payload):
+            if not isinstance(record, dict):
+                return jsonify({
+                    'error': f'Record {i} is not an object',
+                    'status': 'error'
+                }), 400
+            resolved = resolve_input(record)
+            missing_fields = missing_required_fields(resolved)
+            if missing_fields:
+                return jsonify({
+                    'error': f'Record {i} missing required fields: {missing_fields}',
+                    'status': 'error'
+                }), 400
+            try:
+                feat_tuples.append(quantize_features(normalize_input(resolved)))
+            except (TypeError, ValueError) as e:
+                return jsonify({
+                    'error': f'Record {i} invalid input: {e}',
+                    'status': 'error'
+                }), 400
+        
+        # Build (N, 8) feature matrix, quantized exactly like /api/predict, and score it in one call
+        X = np.asarray(feat_tuples, dtype=np.float64)
+        if onnx_session is not None:
+            prediction_proba = onnx_session.run(None, {'input': X.astype(np.float32)})[1]
+        else:
+            prediction_proba = pipeline.predict_proba(X)
+        predictions = (prediction_proba[:, 1] > 0.5).astype(int)  # Ties go to class 0, like argmax
+        non_diabetic_probs = prediction_proba[:, 0] * 100
+        diabetic_probs = prediction_proba[:, 1] * 100
+        risk_levels = np.select(
+            [diabetic_probs < 30, diabetic_probs < 70],
+            ['low', 'medium'],
+            default='high'
+        )
+        
+        results = [
+            {
+                'prediction': int(prediction),
+                'prediction_label': 'Diabetic' if prediction == 1 else 'Non-Diabetic',
+                'confidence': {
+                    'non_diabetic': round(float(non_diabetic_prob), 2),
+                    'diabetic': round(float(diabetic_prob), 2)
+                },
+                'risk_level': str(risk_level)
+            }
+            for prediction, non_diabetic_prob, diabetic_prob, risk_level
+            in zip(predictions, non_diabetic_probs, diabetic_probs, risk_levels)
+        ]
+        
+        return jsonify({
+            'predictions': results,
+            'count': len(results),
+            'timestamp': datetime.now().isoformat(),
+            'status': 'success'
+        })
+        
+    except Exception as e:
+        print(f"Batch prediction error: {str(e)}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Get prediction cache statistics"""
+    return jsonify(_cached_predict.cache_info()._asdict())
+
+# Static dashboard sections, serialized once at import as a JSON object tail
+DASHBOARD_STATIC = {
+    'feature_distribution': {
+        'age_groups': {'<30': 25, '30-50': 45, '>50': 30},
+        'bmi_categories': {'Underweight': 15, 'Normal': 35, 'Overweight': 30, 'Obese': 20},
+        'glucose_levels': {'Normal': 40, 'Prediabetic': 35, 'Diabetic': 25}
+    },
+    'performance_metrics': {
+        'precision': 0.92,
+        'recall': 0.89,
+        'f1_score': 0.90,
+        'auc_score': 0.94
+    }
+}
+_DASHBOARD_STATIC_JSON = b',' + orjson.dumps(DASHBOARD_STATIC)[1:]
+
+DASHBOARD_CACHE_CONTROL = 'private, max-age=5'
+
+def _dashboard_etag(total_predictions, hour_top):
+    """
+    ETag (unquoted) for the dashboard body at a given prediction count and hour.
+    Includes the process token since each gunicorn worker keeps its own analytics.
+    """
+    return f'{_process_token}-{total_predictions}-{int(hour_top)}'
+
 @app.route('/api/analytics/dashboard', methods=['GET'])
 def get_dashboard_data():
     """Get analytics data for dashboard"""
     try:
-        # Calculate time-based analytics
+        # Calculate time-based analytics. All windows are aligned to the top of
+        # the current local hour, so within one process the body depends only on
+        # (total_predictions, hour) and can be ETagged
         now = datetime.now()
-        last_hour = now - timedelta(hours=1)
-        last_24h = now - timedelta(hours=24)
+        top = now.replace(minute=0, second=0, microsecond=0).timestamp() + 3600
+        cutoff = top - 24 * 3600
+        
+        # Unchanged since the client's last poll (same process, prediction count and hour): 304
+        etag = _dashboard_etag(analytics_data['total_predictions'], top)
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = DASHBOARD_CACHE_CONTROL
+            return response
+        
+        # Snapshot shared state; the drainer thread updates it concurrently
+        with _analytics_lock:
+            history = list(analytics_data['predictions_history'])
+            ts_values = analytics_data['ts_array'][:min(analytics_data['ts_index'], HISTORY_SIZE)].copy()
+            total_predictions = analytics_data['total_predictions']
+            risk_distribution = dict(analytics_data['risk_distribution'])
         
         # Filter recent predictions
-        recent_predictions = []
-        for pred in analytics_data['predictions_history']:
-            pred_time = datetime.fromisoformat(pred['timestamp'])
-            if pred_time > last_24h:
-                recent_predictions.append(pred)
-        
-        # Calculate hourly trend
-        hourly_counts = {}
-        for i in range(24):
-            hour_time = now - timedelta(hours=i)
-            hour_key = hour_time.strftime('%H:00')
-            hourly_counts[hour_key] = 0
-        
-        for pred in recent_predictions:
-            pred_time = datetime.fromisoformat(pred['timestamp'])
-            hour_key = pred_time.strftime('%H:00')
-            if hour_key in hourly_counts:
-                hourly_counts[hour_key] += 1
-        
-        # Get feature distribution
-        feature_distribution = {
-            'age_groups': {'<30': 25, '30-50': 45, '>50': 30},
-            'bmi_categories': {'Underweight': 15, 'Normal': 35, 'Overweight': 30, 'Obese': 20},
-            'glucose_levels': {'Normal': 40, 'Prediabetic': 35, 'Diabetic': 25}
-        }
+        recent_predictions = [p for p in history if p['ts_epoch'] > cutoff]
+        
+        # Calculate hourly trend (oldest hour first) in one vectorized pass,
+        # bucketing each prediction into its calendar hour
+        edges = top - np.arange(24, -1, -1) * 3600.0
+        hourly_counts, _ = np.histogram(ts_values, bins=edges)
+        hourly_labels = [datetime.fromtimestamp(edge).strftime('%H:00') for edge in edges[:-1]]
         
         # Prepare dashboard data
         dashboard_data = {
             'overview': {
-                'total_predictions': analytics_data['total_predictions'],
+                'total_predictions': total_predictions,
                 'recent_predictions': len(recent_predictions),
                 'model_accuracy': analytics_data['model_accuracy'],
                 'avg_response_time': 0.3
             },
-            'risk_distribution': analytics_data['risk_distribution'],
+            'risk_distribution': risk_distribution,
             'hourly_trend': {
-                'labels': list(hourly_counts.keys())[::-1],
-                'data': list(hourly_counts.values())[::-1]
+                'labels': hourly_labels,
+                'data': hourly_counts
             },
-            'feature_distribution': feature_distribution,
-            'predictions_timeline': recent_predictions[-10:],  # Last 10 predictions
-            'performance_metrics': {
-                'precision': 0.92,
-                'recall': 0.89,
-                'f1_score': 0.90,
-                'auc_score': 0.94
-            }
+            'predictions_timeline': recent_predictions[-10:]  # Last 10 predictions
         }
         
-        return jsonify(dashboard_data)
+        # Encode only the dynamic part, then splice in the pre-serialized static tail
+        body = orjson.dumps(dashboard_data, option=orjson.OPT_SERIALIZE_NUMPY)[:-1] + _DASHBOARD_STATIC_JSON
+        response = Response(body, mimetype='application/json')
+        response.set_etag(_dashboard_etag(total_predictions, top))
+        response.headers['Cache-Control'] = DASHBOARD_CACHE_CONTROL
+        return response
         
     except Exception as e:
         print(f"Analytics error: {str(e)}")
@@ -257,81 +700,98 @@ def get_recent_predictions():
     """Get recent predictions for feed"""
     try:
         limit = int(request.args.get('limit', 10))
-        recent = analytics_data['predictions_history'][-limit:][::-1]
+        with _analytics_lock:
+            history = analytics_data['predictions_history']
+            recent = list(itertools.islice(history, max(0, len(history) - limit), None))[::-1]
         return jsonify({'predictions': recent})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Static feature descriptions, serialized once at import
+FEATURES_INFO = {
+    'Pregnancies': {
+        'description': 'Number of times pregnant',
+        'normal_range': '0-4',
+        'unit': 'count',
+        'impact': 'Medium'
+    },
+    'Glucose': {
+        'description': 'Plasma glucose concentration',
+        'normal_range': '70-140 mg/dL',
+        'unit': 'mg/dL',
+        'impact': 'High'
+    },
+    'BloodPressure': {
+        'description': 'Diastolic blood pressure',
+        'normal_range': '60-90 mm Hg',
+        'unit': 'mm Hg',
+        'impact': 'Medium'
+    },
+    'SkinThickness': {
+        'description': 'Triceps skin fold thickness',
+        'normal_range': '10-40 mm',
+        'unit': 'mm',
+        'impact': 'Low'
+    },
+    'Insulin': {
+        'description': '2-Hour serum insulin',
+        'normal_range': '16-166 mu U/ml',
+        'unit': 'mu U/ml',
+        'impact': 'Medium'
+    },
+    'BMI': {
+        'description': 'Body mass index',
+        'normal_range': '18.5-24.9',
+        'unit': 'kg/m²',
+        'impact': 'High'
+    },
+    'DiabetesPedigreeFunction': {
+        'description': 'Genetic predisposition to diabetes',
+        'normal_range': '0.08-2.42',
+        'unit': 'score',
+        'impact': 'Medium'
+    },
+    'Age': {
+        'description': 'Age in years',
+        'normal_range': 'All ages',
+        'unit': 'years',
+        'impact': 'High'
+    }
+}
+_FEATURES_JSON = orjson.dumps(FEATURES_INFO)
+
 @app.route('/api/features', methods=['GET'])
 def get_features_info():
     """Get feature descriptions and normal ranges"""
-    features_info = {
-        'Pregnancies': {
-            'description': 'Number of times pregnant',
-            'normal_range': '0-4',
-            'unit': 'count',
-            'impact': 'Medium'
-        },
-        'Glucose': {
-            'description': 'Plasma glucose concentration',
-            'normal_range': '70-140 mg/dL',
-            'unit': 'mg/dL',
-            'impact': 'High'
-        },
-        'BloodPressure': {
-            'description': 'Diastolic blood pressure',
-            'normal_range': '60-90 mm Hg',
-            'unit': 'mm Hg',
-            'impact': 'Medium'
-        },
-        'SkinThickness': {
-            'description': 'Triceps skin fold thickness',
-            'normal_range': '10-40 mm',
-            'unit': 'mm',
-            'impact': 'Low'
-        },
-        'Insulin': {
-            'description': '2-Hour serum insulin',
-            'normal_range': '16-166 mu U/ml',
-            'unit': 'mu U/ml',
-            'impact': 'Medium'
-        },
-        'BMI': {
-            'description': 'Body mass index',
-            'normal_range': '18.5-24.9',
-            'unit': 'kg/m²',
-            'impact': 'High'
-        },
-        'DiabetesPedigreeFunction': {
-            'description': 'Genetic predisposition to diabetes',
-            'normal_range': '0.08-2.42',
-            'unit': 'score',
-            'impact': 'Medium'
-        },
-        'Age': {
-            'description': 'Age in years',
-            'normal_range': 'All ages',
-            'unit': 'years',
-            'impact': 'High'
-        }
-    }
-    
-    return jsonify(features_info)
+    return Response(_FEATURES_JSON, mimetype='application/json')
 
-def generate_health_advice(prediction, diabetic_prob, data):
+def generate_health_advice(prediction, diabetic_prob, features):
     """Generate personalized health advice"""
+    # Advice depends only on these thresholds, so memoize on the boolean key
+    key = (
+        int(prediction),
+        diabetic_prob > 50,
+        features['Glucose'] > 140,
+        features['BMI'] > 25,
+        features['Age'] > 45,
+        features['BloodPressure'] > 130
+    )
+    return list(_advice(key))
+
+@functools.lru_cache(maxsize=128)
+def _advice(key):
+    """Build the advice tuple for a thresholded input key"""
+    prediction, high_prob, high_glucose, high_bmi, older_age, high_bp = key
     advice = []
     
-    if prediction == 1 or diabetic_prob > 50:
+    if prediction == 1 or high_prob:
         advice.append("⚠️ Consult a healthcare professional for proper diagnosis.")
         advice.append("📋 Monitor your blood glucose levels regularly.")
         
-        glucose = float(data.get('Glucose', data.get('glucose', 0)))
-        if glucose > 140:
+        if high_glucose:
             advice.append("🍬 Reduce sugar and refined carbohydrate intake.")
         
-        bmi = float(data.get('BMI', data.get('bmi', 0)))
-        if bmi > 25:
+        if high_bmi:
             advice.append("⚖️ Aim for gradual weight loss through diet and exercise.")
         
         advice.append("🏃‍♂️ Engage in at least 30 minutes of physical activity daily.")
@@ -340,8 +800,7 @@ def generate_health_advice(prediction, diabetic_prob, data):
         advice.append("✅ Continue maintaining a healthy lifestyle.")
         advice.append("🥦 Eat a balanced diet rich in vegetables and fruits.")
         
-        bmi = float(data.get('BMI', data.get('bmi', 0)))
-        if bmi > 25:
+        if high_bmi:
             advice.append("⚖️ Consider weight management to reduce future risk.")
         
         advice.append("💧 Stay hydrated and limit sugary beverages.")
@@ -349,56 +808,56 @@ def generate_health_advice(prediction, diabetic_prob, data):
         advice.append("🩺 Get regular health check-ups every 6-12 months.")
     
     # Additional lifestyle advice
-    age = float(data.get('Age', data.get('age', 30)))
-    if age > 45:
+    if older_age:
         advice.append("👴 Regular screening recommended due to age.")
     
-    bp = float(data.get('BloodPressure', data.get('blood_pressure', 0)))
-    if bp > 130:
+    if high_bp:
         advice.append("❤️ Monitor blood pressure and reduce sodium intake.")
     
-    return advice
+    return tuple(advice)
+
+# Sample data for development, serialized once at import
+SAMPLE_DATA = [
+    {
+        'Pregnancies': 1,
+        'Glucose': 85,
+        'BloodPressure': 66,
+        'SkinThickness': 29,
+        'Insulin': 0,
+        'BMI': 26.6,
+        'DiabetesPedigreeFunction': 0.351,
+        'Age': 31,
+        'description': 'Healthy individual'
+    },
+    {
+        'Pregnancies': 8,
+        'Glucose': 183,
+        'BloodPressure': 64,
+        'SkinThickness': 0,
+        'Insulin': 0,
+        'BMI': 23.3,
+        'DiabetesPedigreeFunction': 0.672,
+        'Age': 32,
+        'description': 'High risk individual'
+    },
+    {
+        'Pregnancies': 1,
+        'Glucose': 89,
+        'BloodPressure': 66,
+        'SkinThickness': 23,
+        'Insulin': 94,
+        'BMI': 28.1,
+        'DiabetesPedigreeFunction': 0.167,
+        'Age': 21,
+        'description': 'Young adult'
+    }
+]
+_SAMPLES_JSON = orjson.dumps({'samples': SAMPLE_DATA})
 
-# Sample data for development
 @app.route('/api/sample-data', methods=['GET'])
 def get_sample_data():
     """Get sample data for testing"""
-    samples = [
-        {
-            'Pregnancies': 1,
-            'Glucose': 85,
-            'BloodPressure': 66,
-            'SkinThickness': 29,
-            'Insulin': 0,
-            'BMI': 26.6,
-            'DiabetesPedigreeFunction': 0.351,
-            'Age': 31,
-            'description': 'Healthy individual'
-        },
-        {
-            'Pregnancies': 8,
-            'Glucose': 183,
-            'BloodPressure': 64,
-            'SkinThickness': 0,
-            'Insulin': 0,
-            'BMI': 23.3,
-            'DiabetesPedigreeFunction': 0.672,
-            'Age': 32,
-            'description': 'High risk individual'
-        },
-        {
-            'Pregnancies': 1,
-            'Glucose': 89,
-            'BloodPressure': 66,
-            'SkinThickness': 23,
-            'Insulin': 94,
-            'BMI': 28.1,
-            'DiabetesPedigreeFunction': 0.167,
-            'Age': 21,
-            'description': 'Young adult'
-        }
-    ]
-    return jsonify({'samples': samples})
+    return Response(_SAMPLES_JSON, mimetype='application/json')
 
 # Error handlers
 @app.errorhandler(404)
@@ -410,5 +869,7 @@ def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
 if __name__ == '__main__':
+    # Dev server: re-scan frontend files per request so new/edited files show up without a restart
+    app.wsgi_app = wrap_static(app.wsgi_app.application, autorefresh=True)
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
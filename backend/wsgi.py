@@ -0,0 +1,14 @@
+"""
+WSGI entry point for production deployment
+
+Run with:
+    gunicorn -w 4 --preload --worker-class=gthread --threads=4 wsgi:app
+
+--preload loads the model once in the master process so workers share it
+via copy-on-write memory after fork.
+"""
+
+from app import app
+
+if __name__ == '__main__':
+    app.run()